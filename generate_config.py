@@ -6,7 +6,10 @@ This utility script helps users generate the JSON configuration for multiple
 playlists by interactively collecting playlist information and testing access.
 
 Usage:
-    python generate_config.py
+    python generate_config.py [--reauth]
+
+The OAuth token is cached in .spotify_cache_config between runs; pass
+--reauth to discard it and log in again.
 
 The script will:
 1. Authenticate with Spotify
@@ -20,21 +23,70 @@ import os
 import sys
 import json
 import re
-from typing import List, Dict, Optional
-import spotipy
-from spotipy.oauth2 import SpotifyOAuth
-from dotenv import load_dotenv
+import argparse
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, Future
+from itertools import islice
+from typing import TYPE_CHECKING, Iterator, List, Dict, Optional
+
+# spotipy and dotenv are imported where they are used to keep startup fast
+if TYPE_CHECKING:
+    import spotipy
+
+# orjson (in requirements.txt) serializes noticeably faster; the stdlib encoder is the fallback
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode('utf-8')
+
+CACHE_PATH = ".spotify_cache_config"
+
+# User playlist listing cached between runs, refreshed in the background once stale
+USER_PLAYLISTS_CACHE_PATH = ".playlist_list_cache_{user_id}.json"
+USER_PLAYLISTS_CACHE_TTL = 3600  # seconds
+
+# Retries for rate-limited (HTTP 429) and 5xx API calls, done by spotipy's session
+API_MAX_RETRIES = 3
+API_BACKOFF_FACTOR = 0.5
+
+# Section separators
+_EQ40 = "=" * 40
+_EQ50 = "=" * 50
+_EQ55 = "=" * 55
+_DASH50 = "-" * 50
+
+# open.spotify.com URL or spotify: URI, matched in a single pass
+_PLAYLIST_URL_RE = re.compile(
+    r'spotify\.com/playlist/([a-zA-Z0-9]{22})'
+    r'|spotify:playlist:([a-zA-Z0-9]{22})'
+)
 
 class PlaylistConfigGenerator:
     def __init__(self):
         """Initialize the Spotify client."""
-        load_dotenv()
+        if os.path.exists('.env'):
+            from dotenv import load_dotenv
+            load_dotenv('.env')
         self.sp = self._authenticate()
-        self.user_id = self._get_current_user_id()
         self.configs = []
-
-    def _authenticate(self) -> spotipy.Spotify:
+        self._config_ids = set()
+        self._executor = ThreadPoolExecutor(max_workers=5)
+        self._user_playlists_future: Optional[Future] = None
+        self._pl_info_cache: Dict[str, Dict] = {}
+        self._pl_info_inflight: Dict[str, Future] = {}
+        self._pl_info_lock = threading.Lock()
+
+    def _authenticate(self) -> 'spotipy.Spotify':
         """Authenticate with Spotify using OAuth."""
+        import spotipy
+        from spotipy.oauth2 import SpotifyOAuth
+
         client_id = os.getenv('SPOTIFY_CLIENT_ID')
         client_secret = os.getenv('SPOTIFY_CLIENT_SECRET')
         redirect_uri = os.getenv('SPOTIFY_REDIRECT_URI', 'http://localhost:8080/callback')
@@ -46,18 +98,25 @@ class PlaylistConfigGenerator:
 
         scope = "playlist-read-private playlist-modify-public playlist-modify-private"
 
+        # Token cache is kept between runs so the refresh token can be reused
         auth_manager = SpotifyOAuth(
             client_id=client_id,
             client_secret=client_secret,
             redirect_uri=redirect_uri,
             scope=scope,
-            cache_path=".spotify_cache_config"
+            cache_path=CACHE_PATH
         )
 
-        return spotipy.Spotify(auth_manager=auth_manager)
+        # spotipy retries 429s itself, waiting for Retry-After between attempts
+        return spotipy.Spotify(
+            auth_manager=auth_manager,
+            status_retries=API_MAX_RETRIES,
+            backoff_factor=API_BACKOFF_FACTOR
+        )
 
-    def _get_current_user_id(self) -> str:
-        """Get the current user's Spotify ID."""
+    @functools.cached_property
+    def user_id(self) -> str:
+        """Get the current user's Spotify ID (fetched on first use)."""
         try:
             user_info = self.sp.current_user()
             return user_info['id']
@@ -70,27 +129,45 @@ class PlaylistConfigGenerator:
         input_str = input_str.strip()
 
         # If it's already a playlist ID (22 character alphanumeric string)
-        if re.match(r'^[a-zA-Z0-9]{22}$', input_str):
+        if len(input_str) == 22 and input_str.isascii() and input_str.isalnum():
             return input_str
 
         # Extract from Spotify URL
-        url_patterns = [
-            r'spotify\.com/playlist/([a-zA-Z0-9]{22})',
-            r'spotify:playlist:([a-zA-Z0-9]{22})'
-        ]
-
-        for pattern in url_patterns:
-            match = re.search(pattern, input_str)
-            if match:
-                return match.group(1)
+        match = _PLAYLIST_URL_RE.search(input_str)
+        if match:
+            return match.group(1) or match.group(2)
 
         return None
 
     def get_playlist_info(self, playlist_id: str) -> Optional[Dict]:
         """Get playlist information and verify access."""
+        with self._pl_info_lock:
+            if playlist_id in self._pl_info_cache:
+                return self._pl_info_cache[playlist_id]
         try:
-            playlist = self.sp.playlist(playlist_id)
-            return {
+            return self._prefetch_playlist_info(playlist_id).result()
+        except Exception as e:
+            print(f"❌ Failed to access playlist {playlist_id}: {e}")
+            return None
+
+    def _prefetch_playlist_info(self, playlist_id: str) -> Future:
+        """Start fetching playlist information, sharing any request already in flight."""
+        with self._pl_info_lock:
+            future = self._pl_info_inflight.get(playlist_id)
+            if future is None:
+                future = self._executor.submit(self._fetch_playlist_info, playlist_id)
+                self._pl_info_inflight[playlist_id] = future
+            return future
+
+    def _fetch_playlist_info(self, playlist_id: str) -> Dict:
+        """Fetch playlist information from Spotify and cache it."""
+        try:
+            # Only request the fields we display, not the first page of tracks
+            playlist = self.sp.playlist(
+                playlist_id,
+                fields='name,owner.display_name,tracks.total,public,description'
+            )
+            playlist_info = {
                 'id': playlist_id,
                 'name': playlist['name'],
                 'owner': playlist['owner']['display_name'],
@@ -98,9 +175,13 @@ class PlaylistConfigGenerator:
                 'public': playlist['public'],
                 'description': playlist.get('description', '')
             }
-        except Exception as e:
-            print(f"❌ Failed to access playlist {playlist_id}: {e}")
-            return None
+            with self._pl_info_lock:
+                self._pl_info_cache[playlist_id] = playlist_info
+            return playlist_info
+        finally:
+            # Errors are reported by get_playlist_info, so speculative prefetches stay quiet
+            with self._pl_info_lock:
+                self._pl_info_inflight.pop(playlist_id, None)
 
     def search_playlists(self, query: str, limit: int = 10) -> List[Dict]:
         """Search for playlists by name."""
@@ -122,31 +203,113 @@ class PlaylistConfigGenerator:
             print(f"❌ Search failed: {e}")
             return []
 
-    def show_user_playlists(self, limit: int = 20) -> List[Dict]:
-        """Show user's own playlists."""
+    def show_user_playlists(self) -> Iterator[Dict]:
+        """Yield user's own playlists, from the on-disk cache when available."""
+        cached = self._load_user_playlists_cache()
+        if cached is not None:
+            yield from cached
+            return
+
+        playlists = []
+        remaining = self._iter_user_playlists()
         try:
-            playlists = []
-            results = self.sp.current_user_playlists(limit=limit)
+            for playlist in remaining:
+                playlists.append(playlist)
+                yield playlist
+        except GeneratorExit:
+            # Listing was cut short, page through the rest in the background and cache the full list
+            self._executor.submit(self._finish_user_playlists_cache, playlists, remaining)
+            raise
+        except Exception as e:
+            print(f"❌ Failed to get user playlists: {e}")
+            return
+
+        self._save_user_playlists_cache(playlists)
 
-            for playlist in results['items']:
-                if playlist['owner']['id'] == self.user_id:
-                    playlists.append({
+    def _iter_user_playlists(self) -> Iterator[Dict]:
+        """Yield user's own playlists from the API, fetching the next page in the background."""
+        user_id = self.user_id
+        try:
+            future = self._prefetch_user_playlists()
+
+            while future:
+                results = future.result()
+                future = None
+                if results['next']:
+                    future = self._executor.submit(self.sp.next, results)
+
+                yield from [
+                    {
                         'id': playlist['id'],
                         'name': playlist['name'],
                         'owner': playlist['owner']['display_name'],
                         'track_count': playlist['tracks']['total'],
                         'public': playlist['public']
-                    })
+                    }
+                    for playlist in results['items']
+                    if playlist['owner']['id'] == user_id
+                ]
+        except Exception:
+            # Don't keep a failed first page around for the next attempt
+            self._user_playlists_future = None
+            raise
+
+    def _load_user_playlists_cache(self) -> Optional[List[Dict]]:
+        """Load cached user playlists, scheduling a background refresh if stale."""
+        cache_path = USER_PLAYLISTS_CACHE_PATH.format(user_id=self.user_id)
+        try:
+            with open(cache_path, 'r') as f:
+                cache = json.load(f)
+            playlists = cache['playlists']
+            fetched_at = cache['fetched_at']
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
 
-            return playlists
-        except Exception as e:
-            print(f"❌ Failed to get user playlists: {e}")
-            return []
+        if time.time() - fetched_at > USER_PLAYLISTS_CACHE_TTL:
+            self._executor.submit(self._refresh_user_playlists_cache)
+        return playlists
+
+    def _save_user_playlists_cache(self, playlists: List[Dict]):
+        """Atomically write the user playlist cache."""
+        cache_path = USER_PLAYLISTS_CACHE_PATH.format(user_id=self.user_id)
+        tmp_path = cache_path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({'fetched_at': time.time(), 'playlists': playlists}, f)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+
+    def _refresh_user_playlists_cache(self):
+        """Re-fetch all of the user's playlists and update the on-disk cache."""
+        self._save_user_playlists_cache(list(self._iter_user_playlists()))
+
+    def _finish_user_playlists_cache(self, playlists: List[Dict], remaining: Iterator[Dict]):
+        """Cache the user's playlists once the pages not yet listed have been fetched."""
+        playlists.extend(remaining)
+        self._save_user_playlists_cache(playlists)
+
+    def _prefetch_user_playlists(self) -> Future:
+        """Start fetching the first page of the user's playlists in the background (once)."""
+        if self._user_playlists_future is None:
+            self._user_playlists_future = self._executor.submit(
+                self.sp.current_user_playlists, limit=50
+            )
+        return self._user_playlists_future
+
+    def close(self):
+        """Stop background work so exiting doesn't wait for a cache refresh to finish."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
 
     def add_playlist_interactive(self) -> bool:
         """Interactive playlist addition."""
         print(f"\n📝 Add Playlist {len(self.configs) + 1}")
-        print("=" * 40)
+        print(_EQ40)
+
+        # Fetch the user's playlists in the background while the menu is shown,
+        # unless they can be served from the on-disk cache
+        if not os.path.exists(USER_PLAYLISTS_CACHE_PATH.format(user_id=self.user_id)):
+            self._prefetch_user_playlists()
 
         while True:
             print("\nChoose an option:")
@@ -170,7 +333,7 @@ class PlaylistConfigGenerator:
 
     def _add_by_url(self) -> bool:
         """Add playlist by URL or ID."""
-        url_or_id = input("\nEnter Spotify playlist URL or ID: ").strip()
+        url_or_id = self._input_with_prefetch("\nEnter Spotify playlist URL or ID: ").strip()
 
         if not url_or_id:
             return False
@@ -182,6 +345,78 @@ class PlaylistConfigGenerator:
 
         return self._confirm_and_add_playlist(playlist_id)
 
+    def _input_with_prefetch(self, prompt: str) -> str:
+        """Read a playlist URL or ID, prefetching its info as soon as an ID is recognized."""
+        try:
+            import termios
+            import tty
+        except ImportError:
+            return input(prompt)
+
+        if not sys.stdin.isatty():
+            return input(prompt)
+
+        fd = sys.stdin.fileno()
+        old_attrs = termios.tcgetattr(fd)
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
+
+        chars = []
+        prefetched_id = None
+        try:
+            # Read keystrokes one at a time; Ctrl-C still raises KeyboardInterrupt in cbreak mode
+            tty.setcbreak(fd)
+            while True:
+                ch = sys.stdin.read(1)
+                if ch in ('', '\n', '\r', '\x04'):
+                    break
+                if ch == '\x1b':
+                    # Cursor and function keys can't be edited in place; drop the whole sequence
+                    self._skip_escape_sequence()
+                    continue
+                if ch in ('\x7f', '\b'):
+                    erase = 1 if chars else 0
+                elif ch == '\x15':  # Ctrl-U: clear the line
+                    erase = len(chars)
+                elif ch == '\x17':  # Ctrl-W: delete the previous word
+                    text = ''.join(chars).rstrip()
+                    erase = len(chars) - (text.rfind(' ') + 1)
+                elif ch.isprintable():
+                    erase = 0
+                    chars.append(ch)
+                    sys.stdout.write(ch)
+                else:
+                    continue
+
+                if erase:
+                    del chars[-erase:]
+                    sys.stdout.write('\b \b' * erase)
+                sys.stdout.flush()
+
+                playlist_id = self.extract_playlist_id(''.join(chars))
+                if playlist_id and playlist_id != prefetched_id:
+                    self._prefetch_playlist_info(playlist_id)
+                    prefetched_id = playlist_id
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, old_attrs)
+            sys.stdout.write('\n')
+            sys.stdout.flush()
+
+        return ''.join(chars)
+
+    def _skip_escape_sequence(self):
+        """Consume the rest of a terminal escape sequence (arrow, Home, End keys, etc.)."""
+        ch = sys.stdin.read(1)
+        if ch == '[':
+            # CSI: parameters, then a final byte in the range '@'..'~'
+            while True:
+                ch = sys.stdin.read(1)
+                if not ch or '@' <= ch <= '~':
+                    break
+        elif ch == 'O':
+            # SS3: a single final character
+            sys.stdin.read(1)
+
     def _add_by_search(self) -> bool:
         """Add playlist by searching."""
         query = input("\nEnter search term: ").strip()
@@ -198,10 +433,10 @@ class PlaylistConfigGenerator:
 
         return self._select_from_list(playlists)
 
-    def _add_from_user_playlists(self) -> bool:
+    def _add_from_user_playlists(self, limit: int = 50) -> bool:
         """Add from user's own playlists."""
         print(f"\n📋 Your playlists:")
-        playlists = self.show_user_playlists()
+        playlists = list(islice(self.show_user_playlists(), limit))
 
         if not playlists:
             print("❌ No playlists found")
@@ -213,9 +448,12 @@ class PlaylistConfigGenerator:
         """Select playlist from a list."""
         print(f"\nFound {len(playlists)} playlist(s):")
 
+        # Emit the whole listing with a single write
+        lines = []
         for i, playlist in enumerate(playlists, 1):
-            print(f"{i:2d}. {playlist['name']}")
-            print(f"     By: {playlist['owner']} | Tracks: {playlist['track_count']} | {'Public' if playlist['public'] else 'Private'}")
+            lines.append(f"{i:2d}. {playlist['name']}")
+            lines.append(f"     By: {playlist['owner']} | Tracks: {playlist['track_count']} | {'Public' if playlist['public'] else 'Private'}")
+        sys.stdout.write("\n".join(lines) + "\n")
 
         while True:
             try:
@@ -227,17 +465,17 @@ class PlaylistConfigGenerator:
                 index = int(choice) - 1
                 if 0 <= index < len(playlists):
                     selected_playlist = playlists[index]
-                    return self._confirm_and_add_playlist(selected_playlist['id'])
+                    return self._confirm_and_add_playlist(selected_playlist['id'], selected_playlist)
                 else:
                     print(f"❌ Please enter a number between 1 and {len(playlists)}")
 
             except ValueError:
                 print("❌ Please enter a valid number")
 
-    def _confirm_and_add_playlist(self, playlist_id: str) -> bool:
+    def _confirm_and_add_playlist(self, playlist_id: str, prefetched_info: Optional[Dict] = None) -> bool:
         """Confirm and add playlist to configuration."""
-        # Get playlist info
-        playlist_info = self.get_playlist_info(playlist_id)
+        # Get playlist info, unless it came with the search or listing results
+        playlist_info = prefetched_info or self.get_playlist_info(playlist_id)
         if not playlist_info:
             return False
 
@@ -248,7 +486,7 @@ class PlaylistConfigGenerator:
         print(f"   Status: {'Public' if playlist_info['public'] else 'Private'}")
 
         # Check if already added
-        if any(config['playlist_id'] == playlist_id for config in self.configs):
+        if playlist_id in self._config_ids:
             print("⚠️  This playlist is already in your configuration")
             return False
 
@@ -267,9 +505,11 @@ class PlaylistConfigGenerator:
         if confirm in ['', 'y', 'yes']:
             config = {
                 'playlist_id': playlist_id,
-                'custom_name': custom_name
+                'custom_name': custom_name,
+                '_info': playlist_info  # Reused during review, not saved
             }
             self.configs.append(config)
+            self._config_ids.add(playlist_id)
             print(f"✅ Added: {playlist_info['name']}")
             return True
 
@@ -282,19 +522,24 @@ class PlaylistConfigGenerator:
             return
 
         print(f"\n📋 Configuration Review ({len(self.configs)} playlists):")
-        print("=" * 50)
+        print(_EQ50)
 
+        lines = []
         for i, config in enumerate(self.configs, 1):
-            playlist_info = self.get_playlist_info(config['playlist_id'])
+            playlist_info = config['_info']
             if playlist_info:
                 archive_name = f"{config['custom_name'] or playlist_info['name']} (Cumulative)"
-                print(f"{i}. {playlist_info['name']}")
-                print(f"   ID: {config['playlist_id']}")
-                print(f"   Archive name: {archive_name}")
-                print(f"   Tracks: {playlist_info['track_count']}")
+                lines.append(f"{i}. {playlist_info['name']}")
+                lines.append(f"   ID: {config['playlist_id']}")
+                lines.append(f"   Archive name: {archive_name}")
+                lines.append(f"   Tracks: {playlist_info['track_count']}")
+        sys.stdout.write("\n".join(lines) + "\n")
 
         print(f"\n🔧 Generated JSON Configuration:")
-        json_config = json.dumps(self.configs, indent=2)
+        # Drop private keys (e.g. cached playlist info) from the saved config
+        saved_configs = [{k: v for k, v in c.items() if not k.startswith('_')} for c in self.configs]
+        json_bytes = _dumps(saved_configs)
+        json_config = json_bytes.decode('utf-8')
         print(json_config)
 
         # Ask where to save
@@ -307,23 +552,26 @@ class PlaylistConfigGenerator:
         choice = input("Choose option (1-4): ").strip()
 
         if choice == '1':
-            self._save_to_file('playlists_config.json', json_config)
+            self._save_to_file('playlists_config.json', json_bytes)
         elif choice == '2':
             self._display_for_github_secrets(json_config)
         elif choice == '3':
             filename = input("Enter filename: ").strip()
             if filename:
-                self._save_to_file(filename, json_config)
+                self._save_to_file(filename, json_bytes)
         elif choice == '4':
             print("💾 Configuration not saved")
         else:
             print("❌ Invalid choice, configuration not saved")
 
-    def _save_to_file(self, filename: str, json_config: str):
+    def _save_to_file(self, filename: str, json_bytes: bytes):
         """Save configuration to file."""
         try:
-            with open(filename, 'w') as f:
-                f.write(json_config)
+            # Write to a temporary file and swap it in so a crash never leaves a partial config
+            tmp_filename = filename + '.tmp'
+            with open(tmp_filename, 'wb') as f:
+                f.write(json_bytes)
+            os.replace(tmp_filename, filename)
             print(f"✅ Configuration saved to {filename}")
             print(f"\n📝 To use in GitHub Actions:")
             print(f"   1. Copy the contents of {filename}")
@@ -334,12 +582,12 @@ class PlaylistConfigGenerator:
     def _display_for_github_secrets(self, json_config: str):
         """Display configuration for GitHub Secrets."""
         print(f"\n🔐 GitHub Secret Configuration:")
-        print("=" * 50)
+        print(_EQ50)
         print("Secret Name: SPOTIFY_PLAYLISTS_CONFIG")
         print("Secret Value (copy everything below this line):")
-        print("-" * 50)
+        print(_DASH50)
         print(json_config)
-        print("-" * 50)
+        print(_DASH50)
         print("\n📝 Instructions:")
         print("1. Go to your GitHub repository")
         print("2. Go to Settings > Secrets and variables > Actions")
@@ -350,7 +598,7 @@ class PlaylistConfigGenerator:
     def run(self):
         """Run the interactive configuration generator."""
         print("🎵 Spotify Playlist Archiver - Configuration Generator")
-        print("=" * 55)
+        print(_EQ55)
         print(f"👤 Logged in as: {self.user_id}")
 
         print(f"\nThis tool will help you create a configuration for multiple playlists.")
@@ -388,22 +636,30 @@ class PlaylistConfigGenerator:
 
 def main():
     """Main function."""
-    try:
-        generator = PlaylistConfigGenerator()
-        generator.run()
+    parser = argparse.ArgumentParser(description="Generate playlist configuration for the archiver")
+    parser.add_argument('--reauth', action='store_true',
+                        help=f"discard the cached OAuth token ({CACHE_PATH}) and log in again")
+    args = parser.parse_args()
 
-        # Clean up cache file
+    if args.reauth:
         try:
-            os.remove(".spotify_cache_config")
-        except:
+            os.remove(CACHE_PATH)
+        except FileNotFoundError:
             pass
 
+    generator = None
+    try:
+        generator = PlaylistConfigGenerator()
+        generator.run()
     except KeyboardInterrupt:
         print(f"\n\n⏹️  Configuration generator interrupted by user")
         sys.exit(0)
     except Exception as e:
         print(f"\n❌ Unexpected error: {e}")
         sys.exit(1)
+    finally:
+        if generator is not None:
+            generator.close()
 
 if __name__ == "__main__":
     main()
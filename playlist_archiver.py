@@ -8,13 +8,39 @@ all tracks to archive playlists. It reuses existing archive playlists if they ex
 
 import os
 import json
+import functools
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, ContextManager, Iterator, List, Dict, Optional, Set, Tuple
+import requests
 import spotipy
+from requests.adapters import HTTPAdapter
 from spotipy.oauth2 import SpotifyOAuth
+from urllib3.util.retry import Retry
 import sys
 
+
+def _json_default(obj):
+    """Serialize track batches as a list of track dicts and anything else unknown as a string."""
+    if isinstance(obj, TrackBatch):
+        return obj.to_dicts()
+    return str(obj)
+
+
+# orjson (in requirements.txt) writes the archive log; the stdlib encoder is the fallback
+try:
+    import orjson
+
+    def _dumps_line(obj) -> bytes:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    def _dumps_line(obj) -> bytes:
+        return (json.dumps(obj, default=_json_default) + '\n').encode('utf-8')
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -22,12 +48,193 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Spotify returns at most 100 playlist items per request
+PAGE_SIZE = 100
+# Concurrent page requests per playlist, kept low to stay under the rate limit
+MAX_PAGE_WORKERS = 5
+# Playlists archived in parallel
+MAX_ARCHIVE_WORKERS = 8
+# Playlist contents cached on disk, keyed by playlist ID and snapshot_id
+CACHE_DIR = '.playlist_cache'
+# HTTP connections kept open to the API, enough for all page and archive workers
+HTTP_POOL_SIZE = 20
+# Refresh a cached access token this long before Spotify says it expires
+TOKEN_EXPIRY_MARGIN = 60  # seconds
+# Archive log, one JSON session per line
+LOG_FILE = 'archive_log.jsonl'
+
+
+def _read_last_line(path: str, chunk_size: int = 65536) -> Optional[bytes]:
+    """Read the last non-empty line of a file without reading the whole file."""
+    with open(path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        data = b''
+        while pos > 0:
+            step = min(chunk_size, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+            stripped = data.rstrip(b'\n')
+            newline = stripped.rfind(b'\n')
+            if newline != -1:
+                return stripped[newline + 1:]
+        return data.rstrip(b'\n') or None
+
+
+class TrackBatch:
+    """
+    Tracks of a source playlist, stored column-wise.
+
+    Each field is kept in its own list so bulk operations such as URI
+    de-duplication walk a single list. Per-track dicts are only built
+    when the batch is written to the archive log.
+    """
+    __slots__ = ('ids', 'names', 'artists', 'uris', 'added_at')
+
+    def __init__(self):
+        self.ids: List[str] = []
+        self.names: List[str] = []
+        self.artists: List[List[str]] = []
+        self.uris: List[str] = []
+        self.added_at: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.uris)
+
+    def append(self, track_id: str, name: str, artists: List[str], uri: str, added_at: str) -> None:
+        """Add a track to the batch."""
+        self.ids.append(track_id)
+        self.names.append(name)
+        self.artists.append(artists)
+        self.uris.append(uri)
+        self.added_at.append(added_at)
+
+    def to_columns(self) -> Dict[str, List]:
+        """Get the batch as a dict of columns."""
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, List]) -> 'TrackBatch':
+        """Create a batch from a dict of columns, raising ValueError if they are malformed."""
+        if not isinstance(columns, dict) or not all(isinstance(columns.get(field), list) for field in cls.__slots__):
+            raise ValueError("track columns missing or not lists")
+        if len({len(columns[field]) for field in cls.__slots__}) != 1:
+            raise ValueError("track columns differ in length")
+        batch = cls()
+        for field in cls.__slots__:
+            setattr(batch, field, columns[field])
+        return batch
+
+    def to_dicts(self) -> List[Dict]:
+        """Get the batch as a list of per-track dicts."""
+        return [
+            {'id': track_id, 'name': name, 'artists': artists, 'uri': uri, 'added_at': added_at}
+            for track_id, name, artists, uri, added_at
+            in zip(self.ids, self.names, self.artists, self.uris, self.added_at)
+        ]
+
+
+class ArchiveOrder:
+    """
+    Orders updates to shared archives across concurrently archived configs.
+
+    A config only touches its archive once every earlier config has finished
+    or resolved to a different archive name, so configs sharing an archive
+    update it in config order, as a sequential run would.
+    """
+
+    def __init__(self, config_count: int):
+        self._archive_names: List[Optional[str]] = [None] * config_count
+        self._finished = [False] * config_count
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def turn(self, index: int, archive_name: str) -> Iterator[None]:
+        """Wait until earlier configs are done with the given archive."""
+        with self._cond:
+            self._archive_names[index] = archive_name
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: all(
+                self._finished[i] or self._archive_names[i] not in (None, archive_name)
+                for i in range(index)
+            ))
+        yield
+
+    def finish(self, index: int) -> None:
+        """Mark a config as done, letting later configs with the same archive proceed."""
+        with self._cond:
+            self._finished[index] = True
+            self._cond.notify_all()
+
+
+class CachedTokenAuthManager:
+    """
+    Auth manager wrapper that shares one access token across threads.
+
+    spotipy asks the auth manager for a token on every request. Caching it
+    behind a lock means concurrent workers reaching expiry trigger a single
+    refresh instead of one each.
+    """
+
+    def __init__(self, auth_manager):
+        self._auth_manager = auth_manager
+        self._token_info: Optional[Dict] = None
+        self._lock = threading.Lock()
+
+    def get_access_token(self, as_dict: bool = False):
+        """Get the cached access token, refreshing it shortly before it expires."""
+        with self._lock:
+            if (self._token_info is None
+                    or self._token_info['expires_at'] - TOKEN_EXPIRY_MARGIN <= time.time()):
+                self._token_info = self._fetch_token_info()
+            return self._token_info if as_dict else self._token_info['access_token']
+
+    def _fetch_token_info(self) -> Dict:
+        """Get the token info from the auth manager's cache, refreshing it if it has expired."""
+        # get_access_token(as_dict=True) is deprecated and will return a bare string,
+        # so the expiry is read from the cache handler instead
+        manager = self._auth_manager
+        token_info = manager.validate_token(manager.cache_handler.get_cached_token())
+        if token_info is None:
+            # Nothing cached yet; the auth flow stores the new token in the cache
+            manager.get_access_token()
+            token_info = manager.validate_token(manager.cache_handler.get_cached_token())
+        return token_info
+
+    def __getattr__(self, name):
+        return getattr(self._auth_manager, name)
+
 
 class PlaylistArchiver:
     def __init__(self):
         """Initialize the Spotify client with OAuth authentication."""
         self.sp = self._authenticate()
         self.user_id = self._get_current_user_id()
+        self._page_executor = ThreadPoolExecutor(max_workers=MAX_PAGE_WORKERS)
+        # User's own playlists by name, loaded once and shared by all archive operations
+        self._archive_name_to_id: Optional[Dict[str, str]] = None
+        self._archive_lock = threading.Lock()
+        # Results from the previous session by source playlist ID, see load_previous_session()
+        self._previous_results: Dict[str, Dict] = {}
+
+    def load_previous_session(self, log_file: str = LOG_FILE) -> None:
+        """Load the last logged session so playlists with an unchanged snapshot can be skipped."""
+        try:
+            last_line = _read_last_line(log_file)
+            if not last_line:
+                return
+
+            session = json.loads(last_line)
+            self._previous_results = {
+                result['original_playlist_id']: result
+                for result in session.get('archives', [])
+                if result.get('success') and result.get('snapshot_id')
+            }
+            logger.info(f"Loaded previous session with {len(self._previous_results)} archived playlist(s)")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Failed to load previous archive session: {e}")
 
     def _authenticate(self) -> spotipy.Spotify:
         """Authenticate with Spotify using OAuth."""
@@ -54,9 +261,30 @@ class PlaylistArchiver:
         refresh_token = os.getenv('SPOTIFY_REFRESH_TOKEN')
         if refresh_token:
             token_info = auth_manager.refresh_access_token(refresh_token)
-            return spotipy.Spotify(auth_manager=auth_manager)
 
-        return spotipy.Spotify(auth_manager=auth_manager)
+        return spotipy.Spotify(
+            auth_manager=CachedTokenAuthManager(auth_manager),
+            requests_session=self._build_session()
+        )
+
+    def _build_session(self) -> requests.Session:
+        """Build an HTTP session with a connection pool sized for concurrent workers."""
+        # read=False: a POST that timed out may already have been applied, and retrying
+        # it would add a batch twice or create a second archive playlist
+        retry = Retry(
+            total=5,
+            read=False,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(['GET', 'POST', 'PUT', 'DELETE']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=retry)
+
+        session = requests.Session()
+        session.mount('https://', adapter)
+        return session
 
     def _get_current_user_id(self) -> str:
         """Get the current user's Spotify ID."""
@@ -67,66 +295,140 @@ class PlaylistArchiver:
             logger.error(f"Failed to get current user: {e}")
             raise
 
-    def get_playlist_tracks(self, playlist_id: str) -> List[Dict]:
-        """Get all tracks from a playlist."""
-        tracks = []
-        results = self.sp.playlist_tracks(playlist_id)
-
-        while results:
-            for item in results['items']:
-                if item['track'] and item['track']['id']:  # Skip local files and None tracks
-                    track_info = {
-                        'id': item['track']['id'],
-                        'name': item['track']['name'],
-                        'artists': [artist['name'] for artist in item['track']['artists']],
-                        'uri': item['track']['uri'],
-                        'added_at': item['added_at']
-                    }
-                    tracks.append(track_info)
-
-            if results['next']:
-                results = self.sp.next(results)
-            else:
-                break
+    def _iter_playlist_items(self, playlist_id: str, fields: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Yield all items of a playlist in order.
 
-        logger.info(f"Retrieved {len(tracks)} tracks from playlist")
-        return tracks
+        The first page is fetched to learn the total, then the remaining pages
+        are requested concurrently.
+        """
+        if fields:
+            # 'total' is needed to know which offsets to request
+            fields = f"total,{fields}"
 
-    def find_existing_archive(self, original_playlist_name: str, custom_name: Optional[str] = None) -> Optional[str]:
-        """Find existing archive playlist by name pattern."""
+        def fetch_page(offset: int) -> Dict:
+            return self.sp.playlist_tracks(playlist_id, fields=fields, limit=PAGE_SIZE, offset=offset)
+
+        first_page = fetch_page(0)
+        yield from first_page['items']
+
+        offsets = range(PAGE_SIZE, first_page['total'], PAGE_SIZE)
+        for page in self._page_executor.map(fetch_page, offsets):
+            yield from page['items']
+
+    def _snapshot_cache_path(self, playlist_id: str, snapshot_id: str) -> str:
+        """Get the cache file path for a playlist snapshot."""
+        safe_snapshot_id = snapshot_id.replace('/', '_')
+        return os.path.join(CACHE_DIR, f"{playlist_id}_{safe_snapshot_id}.json")
+
+    def _load_snapshot_cache(self, playlist_id: str, snapshot_id: Optional[str]):
+        """Load cached playlist contents for a snapshot, if present."""
+        if not snapshot_id:
+            return None
         try:
-            # Generate archive name
-            if custom_name:
-                archive_name = f"{custom_name} (Cumulative)"
+            with open(self._snapshot_cache_path(playlist_id, snapshot_id), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_snapshot_cache(self, playlist_id: str, snapshot_id: Optional[str], data) -> None:
+        """Atomically cache playlist contents for a snapshot, pruning older snapshots."""
+        if not snapshot_id:
+            return
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            cache_path = self._snapshot_cache_path(playlist_id, snapshot_id)
+            tmp_path = f"{cache_path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, cache_path)
+
+            for filename in os.listdir(CACHE_DIR):
+                path = os.path.join(CACHE_DIR, filename)
+                # Leave other workers' in-progress .tmp files alone
+                if filename.startswith(f"{playlist_id}_") and filename.endswith('.json') and path != cache_path:
+                    os.remove(path)
+        except OSError as e:
+            logger.warning(f"Failed to write playlist cache: {e}")
+
+    def _save_archive_cache(self, playlist_id: str, snapshot_id: Optional[str],
+                            track_uris, item_count: int) -> None:
+        """Cache an archive's unique track URIs and item count for a snapshot."""
+        self._save_snapshot_cache(playlist_id, snapshot_id, {'uris': list(track_uris), 'item_count': item_count})
+
+    def get_playlist_tracks(self, playlist_id: str, snapshot_id: Optional[str] = None) -> TrackBatch:
+        """Get all tracks from a playlist, from the snapshot cache when possible."""
+        cached_columns = self._load_snapshot_cache(playlist_id, snapshot_id)
+        if cached_columns is not None:
+            try:
+                tracks = TrackBatch.from_columns(cached_columns)
+            except ValueError as e:
+                logger.warning(f"Ignoring malformed cache for playlist {playlist_id}: {e}")
             else:
-                archive_name = f"{original_playlist_name} (Cumulative)"
+                logger.info(f"Loaded {len(tracks)} tracks from cache for playlist {playlist_id} (unchanged)")
+                return tracks
 
-            results = self.sp.current_user_playlists(limit=50)
-            while results:
-                for playlist in results['items']:
-                    if playlist['name'] == archive_name and playlist['owner']['id'] == self.user_id:
-                        logger.info(f"Found existing archive playlist: {archive_name}")
-                        return playlist['id']
+        tracks = TrackBatch()
 
-                if results['next']:
-                    results = self.sp.next(results)
-                else:
-                    break
+        # Only request the track fields we keep, not album art, markets, etc.
+        items = self._iter_playlist_items(
+            playlist_id,
+            fields="items(added_at,track(id,name,uri,artists(name)))"
+        )
+        for item in items:
+            track = item['track']
+            if track and track['id']:  # Skip local files and None tracks
+                tracks.append(
+                    track['id'],
+                    track['name'],
+                    [artist['name'] for artist in track['artists']],
+                    track['uri'],
+                    item['added_at']
+                )
+
+        logger.info(f"Retrieved {len(tracks)} tracks from playlist {playlist_id}")
+        self._save_snapshot_cache(playlist_id, snapshot_id, tracks.to_columns())
+        return tracks
+
+    def _get_archive_name_map(self) -> Dict[str, str]:
+        """Get the user's own playlists keyed by name, fetching them on first use."""
+        with self._archive_lock:
+            if self._archive_name_to_id is None:
+                name_to_id = {}
+                results = self.sp.current_user_playlists(limit=50)
+                while results:
+                    for playlist in results['items']:
+                        # Keep the first match, as the previous linear scan did
+                        if playlist['owner']['id'] == self.user_id:
+                            name_to_id.setdefault(playlist['name'], playlist['id'])
+
+                    if results['next']:
+                        results = self.sp.next(results)
+                    else:
+                        break
+
+                self._archive_name_to_id = name_to_id
+            return self._archive_name_to_id
+
+    def find_existing_archive(self, archive_name: str) -> Optional[str]:
+        """Find existing archive playlist by name."""
+        try:
+            archive_id = self._get_archive_name_map().get(archive_name)
+            if archive_id:
+                logger.info(f"Found existing archive playlist: {archive_name}")
+                return archive_id
 
             return None
         except Exception as e:
             logger.error(f"Error searching for existing archive: {e}")
             return None
 
-    def create_archive_playlist(self, original_playlist_id: str, archive_name: str) -> str:
+    def create_archive_playlist(self, original_playlist_id: str, original_playlist_name: str, archive_name: str) -> str:
         """Create a new playlist for the archive."""
         try:
-            # Get original playlist info
-            original_playlist = self.sp.playlist(original_playlist_id)
-
             # Create description with original playlist info
             description = (
-                f"Cumulative archive of '{original_playlist['name']}' "
+                f"Cumulative archive of '{original_playlist_name}' "
                 f"(last updated: {datetime.now().strftime('%Y-%m-%d at %H:%M UTC')}). "
                 f"Original playlist: spotify:playlist:{original_playlist_id}"
             )
@@ -139,6 +441,10 @@ class PlaylistArchiver:
                 description=description
             )
 
+            with self._archive_lock:
+                if self._archive_name_to_id is not None:
+                    self._archive_name_to_id[archive_name] = new_playlist['id']
+
             logger.info(f"Created archive playlist: {archive_name}")
             return new_playlist['id']
 
@@ -146,57 +452,81 @@ class PlaylistArchiver:
             logger.error(f"Failed to create archive playlist: {e}")
             raise
 
-    def get_archive_tracks(self, playlist_id: str) -> List[str]:
-        """Get all track URIs from an archive playlist."""
-        track_uris = []
-        try:
-            results = self.sp.playlist_tracks(playlist_id, fields="items(track(uri))")
-
-            while results:
-                for item in results['items']:
-                    if item['track'] and item['track']['uri']:
-                        track_uris.append(item['track']['uri'])
-
-                if results['next']:
-                    results = self.sp.next(results)
-                else:
-                    break
+    def get_archive_track_uris(self, playlist_id: str) -> Tuple[Set[str], int]:
+        """
+        Get the track URIs in an archive playlist, from the snapshot cache when possible.
 
-            logger.info(f"Found {len(track_uris)} existing tracks in archive")
-            return track_uris
+        Returns:
+            The set of unique track URIs and the number of items in the archive,
+            which is larger when the archive holds duplicates
+        """
+        # Interned URIs share one string object per track, so set lookups
+        # usually succeed on an identity check
+        track_uris = set()
+        try:
+            snapshot_id = self.sp.playlist(playlist_id, fields='snapshot_id')['snapshot_id']
+            cached = self._load_snapshot_cache(playlist_id, snapshot_id)
+            if (isinstance(cached, dict)
+                    and isinstance(cached.get('item_count'), int)
+                    and isinstance(cached.get('uris'), list)
+                    and all(isinstance(uri, str) for uri in cached['uris'])):
+                track_uris.update(map(sys.intern, cached['uris']))
+                logger.info(f"Found {cached['item_count']} existing tracks in archive {playlist_id} (cached)")
+                return track_uris, cached['item_count']
+
+            item_count = 0
+            for item in self._iter_playlist_items(playlist_id, fields="items(track(uri))"):
+                item_count += 1
+                if item['track'] and item['track']['uri']:
+                    track_uris.add(sys.intern(item['track']['uri']))
+
+            logger.info(f"Found {item_count} existing tracks in archive {playlist_id}")
+            self._save_archive_cache(playlist_id, snapshot_id, track_uris, item_count)
+            return track_uris, item_count
 
         except Exception as e:
-            logger.error(f"Failed to get archive tracks: {e}")
-            return []
+            # An empty set here would re-add every source track and cache the
+            # incomplete set under the archive's new snapshot, so fail the config
+            logger.error(f"Failed to get tracks of archive {playlist_id}: {e}")
+            raise
 
-    def add_tracks_to_playlist(self, playlist_id: str, track_uris: List[str]) -> None:
-        """Add tracks to a playlist in batches."""
+    def add_tracks_to_playlist(self, playlist_id: str, track_uris: List[str]) -> Optional[str]:
+        """Add tracks to a playlist in batches, returning the resulting snapshot_id."""
         # Spotify API allows max 100 tracks per request
         batch_size = 100
+        snapshot_id = None
+
+        # Batches are sent one at a time: concurrent appends would land in completion
+        # order, and an explicit position past the current end is rejected by the API
 
         for i in range(0, len(track_uris), batch_size):
             batch = track_uris[i:i + batch_size]
             try:
-                self.sp.playlist_add_items(playlist_id, batch)
-                logger.info(f"Added {len(batch)} tracks to playlist (batch {i//batch_size + 1})")
+                snapshot_id = self.sp.playlist_add_items(playlist_id, batch)['snapshot_id']
+                logger.info(f"Added {len(batch)} tracks to playlist {playlist_id} (batch {i//batch_size + 1})")
             except Exception as e:
-                logger.error(f"Failed to add batch {i//batch_size + 1}: {e}")
+                logger.error(f"Failed to add batch {i//batch_size + 1} to playlist {playlist_id}: {e}")
                 raise
 
-    def archive_playlist(self, playlist_id: str, custom_name: Optional[str] = None) -> Dict:
+        return snapshot_id
+
+    def archive_playlist(self, playlist_id: str, custom_name: Optional[str] = None,
+                         archive_turn: Optional[Callable[[str], ContextManager]] = None) -> Dict:
         """
         Archive a playlist by creating or updating a cumulative archive playlist.
 
         Args:
             playlist_id: The Spotify playlist ID to archive
             custom_name: Optional custom name for the archive (will have "(Cumulative)" appended)
+            archive_turn: Optional callable taking the archive name, returning a context
+                manager entered around finding, creating and adding to the archive
 
         Returns:
             Dict with archive information
         """
         try:
             # Get original playlist info
-            original_playlist = self.sp.playlist(playlist_id)
+            original_playlist = self.sp.playlist(playlist_id, fields='name,snapshot_id')
             original_name = original_playlist['name']
 
             # Generate archive name
@@ -205,55 +535,84 @@ class PlaylistArchiver:
             else:
                 archive_name = f"{original_name} (Cumulative)"
 
-            # Get all tracks from original playlist
-            tracks = self.get_playlist_tracks(playlist_id)
-
-            # Check if archive playlist already exists
-            existing_archive_id = self.find_existing_archive(original_name, custom_name)
-
-            if existing_archive_id:
-                logger.info(f"Reusing existing archive playlist: {archive_name}")
-                archive_playlist_id = existing_archive_id
-
-                # Get existing tracks from archive
-                existing_track_uris = self.get_archive_tracks(archive_playlist_id)
-                existing_track_set = set(existing_track_uris)
-
-                if tracks:
-                    # Find new tracks that aren't already in the archive
-                    source_track_uris = [track['uri'] for track in tracks]
-                    new_track_uris = [uri for uri in source_track_uris if uri not in existing_track_set]
+            # Nothing to do if the playlist hasn't changed since the last run and its archive still exists
+            previous = self._previous_results.get(playlist_id)
+            if (previous
+                    and previous['snapshot_id'] == original_playlist['snapshot_id']
+                    and previous.get('archive_playlist') == archive_name
+                    and self.find_existing_archive(archive_name) == previous.get('archive_playlist_id')):
+                action_taken = "no changes (snapshot unchanged)"
+                logger.info(f"Playlist '{original_name}' unchanged since last archive, skipping")
+                return {
+                    'success': True,
+                    'original_playlist': original_name,
+                    'original_playlist_id': playlist_id,
+                    'archive_playlist': archive_name,
+                    'archive_playlist_id': previous['archive_playlist_id'],
+                    'source_track_count': previous.get('source_track_count', 0),
+                    'archive_track_count': previous.get('archive_track_count', 0),
+                    'archived_at': datetime.now().isoformat(),
+                    'action_taken': action_taken,
+                    'snapshot_id': previous['snapshot_id']
+                }
 
-                    if new_track_uris:
-                        self.add_tracks_to_playlist(archive_playlist_id, new_track_uris)
-                        action_taken = f"updated (added {len(new_track_uris)} new tracks)"
-                        logger.info(f"Added {len(new_track_uris)} new tracks to existing archive")
+            # Get all tracks from original playlist (cached while its snapshot is unchanged)
+            tracks = self.get_playlist_tracks(playlist_id, original_playlist['snapshot_id'])
+
+            # Configs sharing an archive name are archived concurrently, so finding or
+            # creating the archive and adding to it must happen one config at a time
+            with archive_turn(archive_name) if archive_turn else nullcontext():
+                # Check if archive playlist already exists
+                existing_archive_id = self.find_existing_archive(archive_name)
+
+                if existing_archive_id:
+                    logger.info(f"Reusing existing archive playlist: {archive_name}")
+                    archive_playlist_id = existing_archive_id
+
+                    # Get existing tracks from archive
+                    archived_uris, archive_track_count = self.get_archive_track_uris(archive_playlist_id)
+
+                    if tracks:
+                        # Find new tracks that aren't already in the archive, skipping
+                        # duplicates within the source playlist as well (order preserved)
+                        new_track_uris = []
+                        for uri in map(sys.intern, tracks.uris):
+                            if uri not in archived_uris:
+                                new_track_uris.append(uri)
+                                archived_uris.add(uri)
+
+                        if new_track_uris:
+                            snapshot_id = self.add_tracks_to_playlist(archive_playlist_id, new_track_uris)
+                            archive_track_count += len(new_track_uris)
+                            self._save_archive_cache(archive_playlist_id, snapshot_id, archived_uris, archive_track_count)
+                            action_taken = f"updated (added {len(new_track_uris)} new tracks)"
+                            logger.info(f"Added {len(new_track_uris)} new tracks to existing archive: {archive_name}")
+                        else:
+                            action_taken = "no changes (all tracks already archived)"
+                            logger.info(f"No new tracks to add - all tracks already in archive: {archive_name}")
                     else:
-                        action_taken = "no changes (all tracks already archived)"
-                        logger.info("No new tracks to add - all tracks already in archive")
+                        action_taken = "no changes (source playlist empty, archive preserved)"
+                        logger.info(f"Source playlist '{original_name}' is empty, but archive playlist preserved")
                 else:
-                    action_taken = "no changes (source playlist empty, archive preserved)"
-                    logger.info("Source playlist is empty, but archive playlist preserved")
-            else:
-                if not tracks:
-                    logger.warning("No tracks found in playlist to archive")
-                    return {
-                        'success': True,
-                        'message': 'Playlist was empty - no archive created',
-                        'original_playlist': original_name,
-                        'track_count': 0
-                    }
-
-                # Create new archive playlist
-                archive_playlist_id = self.create_archive_playlist(playlist_id, archive_name)
-                track_uris = [track['uri'] for track in tracks]
-                self.add_tracks_to_playlist(archive_playlist_id, track_uris)
-                action_taken = "created"
+                    if not tracks:
+                        logger.warning(f"No tracks found in playlist '{original_name}' to archive")
+                        return {
+                            'success': True,
+                            'message': 'Playlist was empty - no archive created',
+                            'original_playlist': original_name,
+                            'track_count': 0
+                        }
+
+                    # Create new archive playlist
+                    archive_playlist_id = self.create_archive_playlist(playlist_id, original_name, archive_name)
+                    # Skip duplicates within the source playlist (order preserved)
+                    track_uris = list(dict.fromkeys(tracks.uris))
+                    snapshot_id = self.add_tracks_to_playlist(archive_playlist_id, track_uris)
+                    archive_track_count = len(track_uris)
+                    self._save_archive_cache(archive_playlist_id, snapshot_id, track_uris, archive_track_count)
+                    action_taken = "created"
 
             # Create summary
-            # Get final track count from archive
-            final_archive_tracks = self.get_archive_tracks(archive_playlist_id)
-
             result = {
                 'success': True,
                 'original_playlist': original_name,
@@ -261,9 +620,10 @@ class PlaylistArchiver:
                 'archive_playlist': archive_name,
                 'archive_playlist_id': archive_playlist_id,
                 'source_track_count': len(tracks),
-                'archive_track_count': len(final_archive_tracks),
+                'archive_track_count': archive_track_count,
                 'archived_at': datetime.now().isoformat(),
                 'action_taken': action_taken,
+                'snapshot_id': original_playlist['snapshot_id'],
                 'tracks': tracks
             }
 
@@ -292,7 +652,7 @@ class PlaylistArchiver:
                     'is_api_restriction': True
                 }
             else:
-                logger.error(f"Failed to archive playlist: {e}")
+                logger.error(f"Failed to archive playlist {playlist_id}: {e}")
                 return {
                     'success': False,
                     'error': str(e),
@@ -310,29 +670,31 @@ class PlaylistArchiver:
         Returns:
             List of archive results
         """
-        results = []
+        if not playlist_configs:
+            return []
 
-        for config in playlist_configs:
+        # Configs sharing an archive still update it in config order
+        order = ArchiveOrder(len(playlist_configs))
+
+        def process(index: int, config: Dict) -> Dict:
             playlist_id = config['playlist_id']
             custom_name = config.get('custom_name')
 
             logger.info(f"Processing playlist: {playlist_id}")
-            result = self.archive_playlist(playlist_id, custom_name)
-            results.append(result)
-
-        return results
-
-    def save_archive_log(self, archive_results: List[Dict], log_file: str = 'archive_log.json') -> None:
-        """Save archive results to a log file."""
+            try:
+                return self.archive_playlist(playlist_id, custom_name, functools.partial(order.turn, index))
+            finally:
+                order.finish(index)
+
+        # Archive playlists concurrently; map() keeps input order. Tasks start in input
+        # order, so the earliest unfinished config is always running and never waits
+        max_workers = min(MAX_ARCHIVE_WORKERS, len(playlist_configs))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(process, range(len(playlist_configs)), playlist_configs))
+
+    def save_archive_log(self, archive_results: List[Dict], log_file: str = LOG_FILE) -> None:
+        """Append this session's archive results to a JSON Lines log file."""
         try:
-            # Load existing log or create new one
-            if os.path.exists(log_file):
-                with open(log_file, 'r') as f:
-                    log_data = json.load(f)
-            else:
-                log_data = {'archive_sessions': []}
-
-            # Add new archive session entry
             session_entry = {
                 'session_date': datetime.now().isoformat(),
                 'archives': archive_results,
@@ -340,11 +702,9 @@ class PlaylistArchiver:
                 'successful_archives': len([r for r in archive_results if r.get('success', False)])
             }
 
-            log_data['archive_sessions'].append(session_entry)
-
-            # Save updated log
-            with open(log_file, 'w') as f:
-                json.dump(log_data, f, indent=2, default=str)
+            # One session per line, so previous sessions are never re-read or rewritten
+            with open(log_file, 'ab') as f:
+                f.write(_dumps_line(session_entry))
 
             logger.info(f"Archive log saved to {log_file}")
 
@@ -371,16 +731,8 @@ def parse_playlist_config() -> List[Dict]:
     # Try comma-separated playlist IDs (handles single or multiple)
     playlist_ids = os.getenv('SPOTIFY_PLAYLIST_IDS')
     if playlist_ids:
-        playlists = []
-        ids_list = [pid.strip() for pid in playlist_ids.split(',') if pid.strip()]
-
-        for pid in ids_list:
-            playlist_config = {
-                'playlist_id': pid,
-                'custom_name': None
-            }
-            playlists.append(playlist_config)
-        return playlists
+        ids = (pid.strip() for pid in playlist_ids.split(','))
+        return [{'playlist_id': pid, 'custom_name': None} for pid in ids if pid]
 
     logger.error("No playlist configuration found. Set SPOTIFY_PLAYLISTS_CONFIG or SPOTIFY_PLAYLIST_IDS")
     sys.exit(1)
@@ -401,6 +753,7 @@ def main():
     # Initialize archiver
     try:
         archiver = PlaylistArchiver()
+        archiver.load_previous_session()
 
         # Archive all playlists
         results = archiver.archive_multiple_playlists(playlist_configs)
@@ -409,8 +762,9 @@ def main():
         archiver.save_archive_log(results)
 
         # Print summary
-        successful = [r for r in results if r.get('success', False)]
-        failed = [r for r in results if not r.get('success', False)]
+        successful, failed = [], []
+        for r in results:
+            (successful if r.get('success', False) else failed).append(r)
 
         print(f"📊 Archive Summary:")
         print(f"   Total playlists: {len(results)}")